@@ -1,11 +1,10 @@
 from __future__ import annotations
 
 import sys
+import time
 import traceback as tb
-from typing import cast
+from typing import TYPE_CHECKING, Mapping, cast
 
-import numpy as np
-from ndv import NDViewer
 from pymmcore_plus import CMMCorePlus, DeviceType
 from pymmcore_plus.mda.handlers import TensorStoreHandler
 from pymmcore_widgets import (
@@ -18,7 +17,7 @@ from pymmcore_widgets import (
     SnapButton,
 )
 from qtpy import QtCore
-from qtpy.QtGui import QAction
+from qtpy.QtGui import QAction, QShowEvent
 from qtpy.QtWidgets import (
     QApplication,
     QDockWidget,
@@ -33,15 +32,48 @@ from qtpy.QtWidgets import (
     QWidget,
 )
 from superqt.utils import ensure_main_thread
-from useq import MDAEvent, MDASequence
 
-from pymmcore_plus_sandbox._console_widget import QtConsole
 from pymmcore_plus_sandbox._mda_button_widget import MDAButton
 from pymmcore_plus_sandbox._settings import DefaultConfigFile, Settings
 from pymmcore_plus_sandbox._stage_widget import StageButton
 from pymmcore_plus_sandbox._utils import ErrorMessageBox, _data_type
 from pymmcore_plus_sandbox._viewfinder import View, Viewfinder
 
+if TYPE_CHECKING:
+    import numpy as np
+    from ndv import NDViewer
+    from useq import MDAEvent, MDASequence
+
+    from pymmcore_plus_sandbox._console_widget import QtConsole
+
+# Minimum time (s) between viewer updates during live view and MDAs - frames
+# arriving faster than this are still acquired (and written), just not displayed.
+DISPLAY_INTERVAL = 1 / 30
+# Minimum time (s) between error dialogs - errors raised faster than this are
+# only written to stderr.
+ERROR_INTERVAL = 1.0
+
+
+def _button_group(toolbar: QToolBar) -> tuple[QGroupBox, QWidget, QHBoxLayout]:
+    """Adds the group box shared by all toolbars to `toolbar`.
+
+    Returns the group box, and the widget (and its layout) holding its buttons.
+    """
+    group = QGroupBox()
+    group.setSizePolicy(QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed)
+    group_layout = QGridLayout()
+
+    btn_wdg = QWidget()
+    btn_wdg.setMaximumHeight(65)
+    btn_wdg_layout = QHBoxLayout()
+    btn_wdg.setLayout(btn_wdg_layout)
+
+    group_layout.addWidget(btn_wdg, 1, 0, 1, 2)
+    group.setLayout(group_layout)
+
+    toolbar.addWidget(group)
+    return group, btn_wdg, btn_wdg_layout
+
 
 class SnapLiveToolBar(QToolBar):
     """Tab exposing widgets for data display."""
@@ -52,16 +84,9 @@ class SnapLiveToolBar(QToolBar):
         self._create_gui()
 
     def _create_gui(self) -> None:
-        self.snap_live_tab = QGroupBox()
-        self.snap_live_tab.setSizePolicy(
-            QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed
-        )
-        self.snap_live_tab_layout = QGridLayout()
+        self.snap_live_tab, self.btn_wdg, self.btn_wdg_layout = _button_group(self)
 
         # snap/live in snap_live_tab
-        self.btn_wdg = QWidget()
-        self.btn_wdg.setMaximumHeight(65)
-        self.btn_wdg_layout = QHBoxLayout()
         self.snap_Button = SnapButton()
         self.btn_wdg_layout.addWidget(self.snap_Button)
         self.live_Button = LiveButton()
@@ -69,13 +94,6 @@ class SnapLiveToolBar(QToolBar):
         self.mda_Button = MDAButton()
         self.btn_wdg_layout.addWidget(self.mda_Button)
 
-        self.btn_wdg.setLayout(self.btn_wdg_layout)
-
-        self.snap_live_tab_layout.addWidget(self.btn_wdg, 1, 0, 1, 2)
-        self.snap_live_tab.setLayout(self.snap_live_tab_layout)
-
-        self.addWidget(self.snap_live_tab)
-
 
 class StageControlToolBar(QToolBar):
     """Tab exposing widgets for stage control."""
@@ -86,25 +104,11 @@ class StageControlToolBar(QToolBar):
         self._create_gui()
 
     def _create_gui(self) -> None:
-        self.snap_live_tab = QGroupBox()
-        self.snap_live_tab.setSizePolicy(
-            QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed
-        )
-        self.snap_live_tab_layout = QGridLayout()
+        self.snap_live_tab, self.btn_wdg, self.btn_wdg_layout = _button_group(self)
 
-        self.btn_wdg = QWidget()
-        self.btn_wdg.setMaximumHeight(65)
-        self.btn_wdg_layout = QHBoxLayout()
         self.stages_Button = StageButton()
         self.btn_wdg_layout.addWidget(self.stages_Button)
 
-        self.btn_wdg.setLayout(self.btn_wdg_layout)
-
-        self.snap_live_tab_layout.addWidget(self.btn_wdg, 1, 0, 1, 2)
-        self.snap_live_tab.setLayout(self.snap_live_tab_layout)
-
-        self.addWidget(self.snap_live_tab)
-
 
 class ShuttersToolBar(QToolBar):
     """
@@ -114,47 +118,69 @@ class ShuttersToolBar(QToolBar):
     https://github.com/pymmcore-plus/pymmcore-widgets/blob/370dfcd5b73de95640fb0cc8aea79ec7f03adfd0/examples/shutters_widget.py#L1
     """
 
-    def __init__(self, mmc: CMMCorePlus | None = None) -> None:
-        super().__init__()
+    def __init__(
+        self, parent: QWidget | None = None, mmc: CMMCorePlus | None = None
+    ) -> None:
+        super().__init__(parent)
         self.mmc = mmc if mmc is not None else CMMCorePlus.instance()
         self.mmc.events.systemConfigurationLoaded.connect(self._refresh_toolbar)
 
-        self.shutter_tab = QGroupBox()
-        self.shutter_tab.setSizePolicy(
-            QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed
-        )
-        self.snap_live_tab_layout = QGridLayout()
-
-        self.btn_wdg = QWidget()
-        self.btn_wdg.setMaximumHeight(65)
-        self.btn_wdg_layout = QHBoxLayout()
-        self.btn_wdg.setLayout(self.btn_wdg_layout)
+        self.shutter_tab, self.btn_wdg, self.btn_wdg_layout = _button_group(self)
 
-        self.snap_live_tab_layout.addWidget(self.btn_wdg, 1, 0, 1, 2)
-        self.shutter_tab.setLayout(self.snap_live_tab_layout)
-
-        self.addWidget(self.shutter_tab)
+        self._shutter_widgets: dict[str, ShuttersWidget] = {}
+        self._needs_refresh = True
         self._refresh_toolbar()
 
     def _refresh_toolbar(self) -> None:
         """Called to refresh the tab with current shutters."""
-        # Remove old shutters
-        for i in reversed(range(self.btn_wdg_layout.count())):
-            self.btn_wdg_layout.itemAt(i).widget().deleteLater()
-
-        # Add new shutters
-        shutter_dev_list = list(self.mmc.getLoadedDevicesOfType(DeviceType.Shutter))
-        if len(shutter_dev_list) == 0:
+        if len(self.mmc.getLoadedDevicesOfType(DeviceType.Shutter)) == 0:
             self.hide()
+            return
+        # Shutter widgets are only (re)built once the toolbar is on screen
+        # NB show() only defers to the showEvent while some parent is still hidden
+        self._needs_refresh = True
+        if self.isVisible():
+            self._create_shutters()
         else:
             self.show()
-            for idx, shutter_dev in enumerate(shutter_dev_list):
-                # bool to display the autoshutter checkbox only with the last shutter
-                autoshutter = bool(idx >= len(shutter_dev_list) - 1)
-                shutter = ShuttersWidget(shutter_dev, autoshutter=autoshutter)
+
+    def showEvent(self, event: QShowEvent | None) -> None:
+        if self._needs_refresh:
+            self._create_shutters()
+        super().showEvent(event)
+
+    def _create_shutters(self) -> None:
+        self._needs_refresh = False
+        shutter_dev_list = self.mmc.getLoadedDevicesOfType(DeviceType.Shutter)
+        # Only the shutters that were loaded/unloaded are touched - a widget
+        # that is kept keeps itself in sync with its (reloaded) device.
+        self.btn_wdg.setUpdatesEnabled(False)
+
+        # Remove old shutters
+        for shutter_dev in set(self._shutter_widgets) - set(shutter_dev_list):
+            self._shutter_widgets.pop(shutter_dev).deleteLater()
+
+        # Add new shutters
+        for shutter_dev in shutter_dev_list:
+            if shutter_dev not in self._shutter_widgets:
+                shutter = ShuttersWidget(shutter_dev, autoshutter=False)
                 shutter.button_text_open = shutter_dev
                 shutter.button_text_closed = shutter_dev
                 self.btn_wdg_layout.addWidget(shutter)
+                self._shutter_widgets[shutter_dev] = shutter
+
+        # display the autoshutter checkbox only with the last shutter
+        # NB ShuttersWidget only hides its checkbox on construction, but reads its
+        # autoshutter flag whenever it refreshes - both have to follow the last one.
+        shutters = tuple(self._shutter_widgets.values())
+        for shutter in shutters:
+            last = shutter is shutters[-1]
+            if shutter.autoshutter != last:
+                shutter.autoshutter = last
+                shutter.autoshutter_checkbox.setVisible(last)
+                shutter._refresh_shutter_widget()
+
+        self.btn_wdg.setUpdatesEnabled(True)
 
 
 class CentralWidget(QWidget):
@@ -165,12 +191,17 @@ class CentralWidget(QWidget):
     ) -> None:
         super().__init__(parent=parent)
         self._layout = QHBoxLayout()
-
-        centerWidget = GroupPresetTableWidget(parent=self)
-        self._layout.addWidget(centerWidget)
+        # Created on first show - it queries the core for every group/preset
+        self.group_preset_table: GroupPresetTableWidget | None = None
 
         self.setLayout(self._layout)
 
+    def showEvent(self, event: QShowEvent | None) -> None:
+        if self.group_preset_table is None:
+            self.group_preset_table = GroupPresetTableWidget(parent=self)
+            self._layout.addWidget(self.group_preset_table)
+        super().showEvent(event)
+
 
 class APP(QMainWindow):
     """Create a QToolBar for the Main Window."""
@@ -179,14 +210,35 @@ class APP(QMainWindow):
         super().__init__()
         self._mmc = CMMCorePlus.instance() if mmc is None else mmc
         sys.excepthook = self._on_error
+        self._last_error = -ERROR_INTERVAL
 
         self._settings = Settings(settings=[DefaultConfigFile(self._mmc)])
 
         self.setWindowTitle("PyMMCore Plus Sandbox")
         self.viewfinder = Viewfinder(self._mmc)
         self.current_mda: NDViewer | None = None
+        # The handler frames of the running (or last) MDA are written to
+        self.mda_data: TensorStoreHandler | None = None
+        # The handler whose data current_mda displays
+        self._current_mda_handler: TensorStoreHandler | None = None
+        # Whether current_mda has been given its datastore yet
+        self._current_mda_wrapped = False
+        self._last_shown_mda_index: Mapping[str, int] | None = None
         self.mdas: list[NDViewer] = []
-        self._live_timer_id: int | None = None
+        # The MDA being acquired - set when it starts, and only cleared by the end of
+        # that same sequence
+        self._running_mda: MDASequence | None = None
+        # The handler and event of the most recently written MDA frame
+        self._latest_mda_frame: tuple[TensorStoreHandler, MDAEvent] | None = None
+        # Refreshes current_mda with the latest frame, at most at display rate
+        self._mda_timer = QtCore.QTimer(self)
+        self._mda_timer.setInterval(int(DISPLAY_INTERVAL * 1000))
+        self._mda_timer.timeout.connect(self._show_mda_frame)
+        # NB a (default) coarse timer is plenty for polling at display rate
+        self._live_timer = QtCore.QTimer(self)
+        self._live_timer.timeout.connect(self._update_viewer)
+        # The circular buffer's image count when live view last showed a frame
+        self._last_image_count = 0
 
         # Menus
         self._create_menus()
@@ -196,7 +248,8 @@ class APP(QMainWindow):
         toolbar_items = [
             SnapLiveToolBar(),
             StageControlToolBar(),
-            ShuttersToolBar(),
+            # NB parented, so that its shutters are built once the window shows
+            ShuttersToolBar(parent=self),
         ]
         for item in toolbar_items:
             if item:
@@ -215,13 +268,34 @@ class APP(QMainWindow):
         )
         self._mmc.events.sequenceAcquisitionStopped.connect(self._stop_live_viewer)
 
+        # Camera signals
+        # Exposure of the current camera, cleared whenever it may have changed
+        self._exposure: float | None = None
+        self._mmc.events.systemConfigurationLoaded.connect(self._invalidate_camera)
+        # NB presets emit configSet rather than propertyChanged
+        self._mmc.events.configSet.connect(self._invalidate_camera)
+        self._mmc.events.propertiesChanged.connect(self._invalidate_camera)
+        self._mmc.events.propertyChanged.connect(self._on_property_changed)
+        self._mmc.events.exposureChanged.connect(self._on_exposure_changed)
+
         # MDA signals
         self._mmc.mda.events.frameReady.connect(self._on_mda_frame)
         self._mmc.mda.events.sequenceStarted.connect(self._on_mda_started)
         self._mmc.mda.events.sequenceFinished.connect(self._on_mda_finished)
 
     def _on_error(self, type, value, traceback):
-        msg = "".join(tb.format_exception(value))
+        # Don't bury the user in dialogs when errors are raised in quick succession
+        now = time.monotonic()
+        if now - self._last_error < ERROR_INTERVAL:
+            sys.stderr.write(f"{type.__name__}: {value}\n")
+            return
+        self._last_error = now
+        self._show_error(value)
+
+    @ensure_main_thread  # type: ignore [misc]
+    def _show_error(self, value: BaseException) -> None:
+        # NB dialogs can only be created on the GUI thread
+        msg = "".join(tb.TracebackException.from_exception(value).format())
         box = ErrorMessageBox(
             "Operation raised the following Exception. Please post this output "
             "and what you did to get it "
@@ -284,6 +358,9 @@ class APP(QMainWindow):
 
     def _launch_console(self):
         if self.console is None:
+            # NB qtconsole (and its IPython kernel) are only loaded on request
+            from pymmcore_plus_sandbox._console_widget import QtConsole
+
             # All values in the dictionary below can be accessed from the console using
             # the associated string key
             user_vars = {
@@ -353,11 +430,34 @@ class APP(QMainWindow):
         # Return viewfinder (for convenience)
         return self.viewfinder
 
+    # -- CAMERA -- #
+
+    def _invalidate_camera(self) -> None:
+        self._exposure = None
+        self._update_live_interval()
+
+    def _on_property_changed(self, device: str, prop: str, value: str) -> None:
+        # Exposure is a camera property - and Core.Camera selects the camera
+        if device in (self._mmc.getCameraDevice(), "Core"):
+            self._invalidate_camera()
+
+    def _camera_exposure(self) -> float:
+        """The exposure of the current camera, queried only after changes."""
+        if self._exposure is None:
+            self._exposure = self._mmc.getExposure()
+        return self._exposure
+
+    def _on_exposure_changed(self, camera: str, exposure: float) -> None:
+        if camera != self._mmc.getCameraDevice():
+            return
+        self._exposure = exposure
+        self._update_live_interval()
+
     # -- SNAP VIEWER -- #
 
     @ensure_main_thread  # type: ignore [misc]
     def _handle_snap(self):
-        if self._mmc.mda.is_running():
+        if self._running_mda is not None:
             # This signal is emitted during MDAs as well - we want to ignore those.
             return
         viewfinder = self._set_up_viewfinder()
@@ -371,65 +471,146 @@ class APP(QMainWindow):
         viewfinder.live_view = True
 
         # Start timer to update live viewer
-        interval = int(self._mmc.getExposure())
-        self._live_timer_id = self.startTimer(
-            interval, QtCore.Qt.TimerType.PreciseTimer
-        )
+        self._last_image_count = 0
+        self._live_timer.start(self._live_interval())
+
+    def _live_interval(self) -> int:
+        # Once per exposure, but no faster than the display refresh rate.
+        return max(int(self._camera_exposure()), int(DISPLAY_INTERVAL * 1000))
+
+    @ensure_main_thread  # type: ignore [misc]
+    def _update_live_interval(self) -> None:
+        if self._live_timer.isActive():
+            self._live_timer.setInterval(self._live_interval())
 
     def _stop_live_viewer(self, cameraLabel: str) -> None:
         # Pause live viewer, but leave it open.
         if self.viewfinder.live_view:
             self.viewfinder.live_view = False
-            self.killTimer(self._live_timer_id)
-            self._live_timer_id = None
+            self._live_timer.stop()
 
     def _update_viewer(self, data: np.ndarray | None = None) -> None:
         """Update viewer with the latest image from the circular buffer."""
         if data is None:
-            if self._mmc.getRemainingImageCount() == 0:
+            # NB the buffer is shared (e.g. with scripts in the console), so frames
+            # are never popped or cleared here. A new frame changes the count -
+            # the camera resets the buffer when it overflows during live view.
+            count = self._mmc.getRemainingImageCount()
+            if count == 0 or count == self._last_image_count:
                 return
             try:
-                if self.viewfinder:
-                    self.viewfinder.set_data(self._mmc.getLastImage())
+                data = self._mmc.getLastImage()
             except (RuntimeError, IndexError):
-                # circular buffer empty
+                # circular buffer emptied since the count check
                 return
+            self._last_image_count = count
+        self.viewfinder.set_data(data)
 
     # -- MDA VIEWER -- #
 
-    def timerEvent(self, a0: QtCore.QTimerEvent | None) -> None:
-        """Handles TimerEvents."""
-        # Handle the timer event by updating the viewer (on gui thread)
-        self._update_viewer()
-
-    @ensure_main_thread  # type: ignore [misc]
     def _on_mda_frame(self, image: np.ndarray, event: MDAEvent) -> None:
         """Called on the `frameReady` event from the core."""
-        self.mda_data.frameReady(image, event, {})
-        current_mda = cast(NDViewer, self.current_mda)
-        if not hasattr(current_mda, "_data_wrapper"):
-            current_mda.set_data(self.mda_data.store)
+        # NB this runs on the acquisition thread - the viewer picks the frame up on
+        # its next refresh.
+        # NB set before the first frame, and kept until the sequence has finished
+        handler = cast("TensorStoreHandler", self.mda_data)
+        handler.frameReady(image, event, {})
+        if handler is self.mda_data:
+            # Never republish a handler that has been released meanwhile
+            self._latest_mda_frame = (handler, event)
+
+    def _show_mda_frame(
+        self, latest: tuple[TensorStoreHandler, MDAEvent] | None = None
+    ) -> None:
+        """Displays `latest`, by default the latest frame from `_on_mda_frame`."""
+        if latest is None and (latest := self._latest_mda_frame) is None:
+            return
+        handler, event = latest
+        if handler is not self._current_mda_handler:
+            # Written by an MDA whose viewer hasn't been created yet
+            return
+        if (current_mda := self.current_mda) is None or not current_mda.isVisible():
+            # Nobody is watching - skip the redraw
+            return
+        if not self._current_mda_wrapped:
+            current_mda.set_data(handler.store)
+            self._current_mda_wrapped = True
+        elif event.index == self._last_shown_mda_index:
+            # No new frame since the last refresh
+            return
         current_mda.set_current_index(event.index)
+        self._last_shown_mda_index = event.index
 
-    @ensure_main_thread  # type: ignore [misc]
     def _on_mda_started(self, sequence: MDASequence) -> None:
         """Create temp folder and block gui when mda starts."""
         # TODO this field is likely limiting - consider throwing it in metadata?
         # TODO can we discern whether the sequence is being written to file?
         # If so, should we avoid viewing it?
         # TODO consider whether/how to expose other datastores
-        self.mda_data = TensorStoreHandler(
+        self._running_mda = sequence
+        # NB the handler is created here, on the acquisition thread, so that it
+        # exists before the first frame is written.
+        self.mda_data = handler = TensorStoreHandler(
             driver="zarr",
             kvstore={"driver": "memory"},
-            spec={"dtype": _data_type(self._mmc)},
+            spec={"dtype": _data_type(self._mmc).name},
         )
-        self.current_mda = View()
+        self._create_mda_viewer(handler)
+
+    @ensure_main_thread  # type: ignore [misc]
+    def _create_mda_viewer(self, handler: TensorStoreHandler) -> None:
+        view = View()
+        # Closing the viewer frees it - and, once the MDA has finished, its data
+        view.setAttribute(QtCore.Qt.WidgetAttribute.WA_DeleteOnClose)
+        view.destroyed.connect(lambda: self._on_mda_viewer_destroyed(view))
+        self.current_mda = view
+        self._current_mda_handler = handler
+        self._current_mda_wrapped = False
+        self._last_shown_mda_index = None
         self.current_mda.show()
         self.mdas.append(self.current_mda)
+        self._mda_timer.start()
+
+    def _on_mda_viewer_destroyed(self, view: NDViewer) -> None:
+        self.mdas.remove(view)
+        if view is not self.current_mda:
+            return
+        handler = self._current_mda_handler
+        self.current_mda = None
+        self._current_mda_handler = None
+        if handler is self.mda_data and self._running_mda is not None:
+            # Still being acquired into - released once the sequence has finished
+            return
+        self._release_mda_data(handler)
+
+    def _release_mda_data(self, handler: TensorStoreHandler | None) -> None:
+        """Drops the references held here to `handler`, so that its data is freed."""
+        if self.mda_data is handler:
+            self.mda_data = None
+        if self._latest_mda_frame is not None and self._latest_mda_frame[0] is handler:
+            self._latest_mda_frame = None
 
     def _on_mda_finished(self, sequence: MDASequence) -> None:
-        # Nothing to do...yet
-        pass
+        # NB this runs on the acquisition thread, before the next MDA can start - so
+        # the latest frame is still one of this sequence.
+        self._finish_mda(sequence, self._latest_mda_frame)
+
+    @ensure_main_thread  # type: ignore [misc]
+    def _finish_mda(
+        self,
+        sequence: MDASequence,
+        latest: tuple[TensorStoreHandler, MDAEvent] | None,
+    ) -> None:
+        # NB cleared on the GUI thread, after any snaps queued during the MDA. The
+        # next MDA may have started by now - it must stay marked as running.
+        if sequence is self._running_mda:
+            self._running_mda = None
+            self._mda_timer.stop()
+            if self.mda_data is not self._current_mda_handler:
+                # Its viewer was closed during the acquisition
+                self._release_mda_data(self.mda_data)
+        # Display the final frame, which may have arrived after the last refresh
+        self._show_mda_frame(latest)
 
 
 def launch():
@@ -5,10 +5,11 @@ from typing import Union
 from fonticon_mdi6 import MDI6
 from pymmcore_plus import CMMCorePlus
 from pymmcore_widgets import MDAWidget
-from qtpy.QtCore import QSize, Qt
+from qtpy.QtCore import Qt
 from qtpy.QtGui import QColor
 from qtpy.QtWidgets import QPushButton, QSizePolicy, QWidget
-from superqt.fonticon import icon
+
+from pymmcore_plus_sandbox._utils import _ICON_SIZE, _cached_icon
 
 COLOR_TYPES = Union[
     QColor,
@@ -74,8 +75,8 @@ class MDAButton(QPushButton):
 
     def _create_button(self) -> None:
         self.setText("Multi-D Acq.")
-        self.setIcon(icon(MDI6.movie_roll, color=(0, 255, 0)))
-        self.setIconSize(QSize(30, 30))
+        self.setIcon(_cached_icon(MDI6.movie_roll, (0, 255, 0)))
+        self.setIconSize(_ICON_SIZE)
         self.clicked.connect(self.launch_mda)
 
     def launch_mda(self) -> None:
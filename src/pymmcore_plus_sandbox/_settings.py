@@ -89,6 +89,9 @@ class DefaultConfigFile(Setting):
 
 
 SETTINGS_FILE = "settings.yml"
+# Prefer the LibYAML bindings, when PyYAML was built with them
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
 
 
 class Settings:
@@ -103,7 +106,7 @@ class Settings:
         # Load configuration settings if present
         if path.exists(SETTINGS_FILE):
             with open(SETTINGS_FILE) as cf:
-                self.saved_values.update(yaml.safe_load(cf))
+                self.saved_values.update(yaml.load(cf, Loader=_YAML_LOADER))
 
         for s in settings:
             self.add(s)
@@ -126,4 +129,4 @@ class Settings:
 
             # Save settings
             with open(SETTINGS_FILE, "w") as cf:
-                yaml.safe_dump(yaml_results, cf)
+                yaml.dump(yaml_results, cf, Dumper=_YAML_DUMPER)
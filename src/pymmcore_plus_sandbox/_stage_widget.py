@@ -1,7 +1,6 @@
 from fonticon_mdi6 import MDI6
 from pymmcore_plus import CMMCorePlus, DeviceType
 from pymmcore_widgets import StageWidget
-from qtpy.QtCore import QSize
 from qtpy.QtGui import QCloseEvent
 from qtpy.QtWidgets import (
     QGroupBox,
@@ -10,7 +9,8 @@ from qtpy.QtWidgets import (
     QSizePolicy,
     QWidget,
 )
-from superqt.fonticon import icon
+
+from pymmcore_plus_sandbox._utils import _ICON_SIZE, _cached_icon
 
 
 class StageButton(QPushButton):
@@ -62,8 +62,8 @@ class StageButton(QPushButton):
 
     def _create_button(self) -> None:
         self.setText("Stage Control")
-        self.setIcon(icon(MDI6.arrow_all, color=(0, 255, 0)))
-        self.setIconSize(QSize(30, 30))
+        self.setIcon(_cached_icon(MDI6.arrow_all, (0, 255, 0)))
+        self.setIconSize(_ICON_SIZE)
         self.clicked.connect(self.launch_stage_control)
 
     def launch_stage_control(self) -> None:
@@ -90,22 +90,19 @@ class StagesWidget(QWidget):
 
         self.setLayout(QHBoxLayout())
         self.setWindowTitle("Stage Control")
-        self.stage_dev_list = list(self.mmc.getLoadedDevicesOfType(DeviceType.XYStage))
-        self.stage_dev_list.extend(
-            iter(self.mmc.getLoadedDevicesOfType(DeviceType.Stage))
-        )
-
-        for stage_dev in self.stage_dev_list:
-            if self.mmc.getDeviceType(stage_dev) is DeviceType.XYStage:
-                bx = QGroupBox("XY Control")
-                bx.setLayout(QHBoxLayout())
-                bx.layout().addWidget(StageWidget(device=stage_dev))
-                self.layout().addWidget(bx)
-            if self.mmc.getDeviceType(stage_dev) is DeviceType.Stage:
-                bx = QGroupBox("Z Control")
+        xy_stages = self.mmc.getLoadedDevicesOfType(DeviceType.XYStage)
+        z_stages = self.mmc.getLoadedDevicesOfType(DeviceType.Stage)
+        self.stage_dev_list = [*xy_stages, *z_stages]
+
+        # Lay out all stages in one go
+        self.setUpdatesEnabled(False)
+        for title, stage_devs in (("XY Control", xy_stages), ("Z Control", z_stages)):
+            for stage_dev in stage_devs:
+                bx = QGroupBox(title)
                 bx.setLayout(QHBoxLayout())
                 bx.layout().addWidget(StageWidget(device=stage_dev))
                 self.layout().addWidget(bx)
+        self.setUpdatesEnabled(True)
 
     def has_stages(self) -> bool:
         return len(self.stage_dev_list) != 0
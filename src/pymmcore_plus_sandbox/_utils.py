@@ -1,7 +1,22 @@
-import tensorstore as ts
+from __future__ import annotations
+
+from functools import lru_cache
+
+import numpy as np
 from pymmcore_plus import CMMCorePlus
-from qtpy.QtGui import QFontMetrics, QGuiApplication
+from qtpy.QtCore import QSize
+from qtpy.QtGui import QFontMetrics, QGuiApplication, QIcon
 from qtpy.QtWidgets import QDialog, QDialogButtonBox, QGridLayout, QLabel, QTextEdit
+from superqt.fonticon import icon
+
+_BPP_TO_DTYPE = {
+    1: np.dtype(np.uint8),
+    2: np.dtype(np.uint16),
+    4: np.dtype(np.uint32),
+}
+
+# Icon size used by all of the sandbox's buttons
+_ICON_SIZE = QSize(30, 30)
 
 
 class ErrorMessageBox(QDialog):
@@ -42,13 +57,15 @@ class ErrorMessageBox(QDialog):
         self.setLayout(self._layout)
 
 
-def _data_type(mmc: CMMCorePlus):
+def _data_type(mmc: CMMCorePlus) -> np.dtype:
     px_type = mmc.getBytesPerPixel()
-    if px_type == 1:
-        return ts.uint8
-    elif px_type == 2:
-        return ts.uint16
-    elif px_type == 4:
-        return ts.uint32
-    else:
-        raise Exception(f"Unsupported Pixel Type: {px_type}")
+    try:
+        return _BPP_TO_DTYPE[px_type]
+    except KeyError:
+        raise Exception(f"Unsupported Pixel Type: {px_type}") from None
+
+
+@lru_cache(maxsize=64)
+def _cached_icon(glyph: str, color: tuple[int, int, int]) -> QIcon:
+    """Returns the icon for `glyph`, shared between all buttons using it."""
+    return icon(glyph, color=color)
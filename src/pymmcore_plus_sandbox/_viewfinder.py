@@ -1,28 +1,52 @@
 from __future__ import annotations
 
-from os import path
+from concurrent.futures import ThreadPoolExecutor
+from os import cpu_count, path
 from typing import TYPE_CHECKING, Any, Hashable, Iterable, Mapping
 
-import tensorstore as ts
+import numpy as np
 import tifffile
 from fonticon_mdi6 import MDI6
 from ndv import DataWrapper, NDViewer
 from pymmcore_plus import CMMCorePlus
 from pymmcore_widgets import LiveButton, SnapButton
-from qtpy.QtCore import QSize
+from qtpy.compat import isalive
+from qtpy.QtCore import Qt
 from qtpy.QtGui import QCloseEvent
 from qtpy.QtWidgets import QFileDialog, QPushButton, QSizePolicy, QWidget
 from superqt import ensure_main_thread
-from superqt.fonticon import icon
 
-from pymmcore_plus_sandbox._utils import _data_type
+from pymmcore_plus_sandbox._utils import _ICON_SIZE, _cached_icon
 
 if TYPE_CHECKING:
     from concurrent.futures import Future
 
-    import numpy as np
     from ndv import Indices
 
+# Number of camera configurations the Viewfinder keeps a buffer for
+MAX_BUFFERS = 4
+
+# Writes TIFFs off the GUI thread; a single worker keeps saves in order
+_SAVE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tiff-save")
+# Fast lossless compression - horizontal differencing (predictor) lets deflate
+# shrink typical 16-bit microscopy frames considerably at level 1
+_TIFF_OPTIONS: dict[str, Any] = {
+    "compression": "zlib",
+    "compressionargs": {"level": 1},
+    "predictor": True,
+    # Compress strips in parallel
+    "maxworkers": cpu_count(),
+}
+# Write buffer for saved TIFFs - fewer, larger writes help on network drives
+_TIFF_BUFFER_SIZE = 2 * 1024 * 1024
+
+
+def _write_tiff(file: str, data: np.ndarray) -> None:
+    with open(file, "wb", buffering=_TIFF_BUFFER_SIZE) as fh:
+        # Same cut-off tifffile.imwrite uses to switch to BigTIFF
+        with tifffile.TiffWriter(fh, bigtiff=data.nbytes > 2**32 - 2**25) as tw:
+            tw.write(data, **_TIFF_OPTIONS)
+
 
 class SaveButton(QPushButton):
     """Create a QPushButton to save Viewfinder data.
@@ -57,8 +81,8 @@ class SaveButton(QPushButton):
 
     def _create_button(self) -> None:
         self.setText("Save")
-        self.setIcon(icon(MDI6.content_save, color=(0, 255, 0)))
-        self.setIconSize(QSize(30, 30))
+        self.setIcon(_cached_icon(MDI6.content_save, (0, 255, 0)))
+        self.setIconSize(_ICON_SIZE)
 
         self.clicked.connect(self._save_data)
 
@@ -74,13 +98,28 @@ class SaveButton(QPushButton):
         )
         (p, extension) = path.splitext(file)
         if extension == ".tif":
-            data = self._viewer.data_wrapper.isel({})
+            data = np.asarray(self._viewer.data_wrapper.isel({}))
+            if isinstance(self._viewer, Viewfinder):
+                # Copy now - the Viewfinder buffer is overwritten by the next frame
+                data = data.copy()
             # TODO: Save metadata?
-            tifffile.imwrite(file, data=data)
+            self.setEnabled(False)
+            future = _SAVE_EXECUTOR.submit(_write_tiff, file, data)
+            future.add_done_callback(self._on_saved)
         # TODO: Zarr seems like it would be easily supported through
         # self._view.data_wrapper.save_as_zarr, but it is not implemented
         # by TensorStoreWrapper
 
+    @ensure_main_thread  # type: ignore
+    def _on_saved(self, future: Future[None]) -> None:
+        try:
+            # Re-raise any write error on the main thread, where it is reported
+            future.result()
+        finally:
+            # NB the View (and this button) may have been closed during the save
+            if isalive(self):
+                self.setEnabled(True)
+
 
 class ExportButton(QPushButton):
     """Create a QPushButton to create a View from the Viewfinder's current data.
@@ -116,8 +155,8 @@ class ExportButton(QPushButton):
     def _create_button(self) -> None:
         # TODO: Better button text
         self.setText("Export")
-        self.setIcon(icon(MDI6.export, color=(0, 255, 0)))
-        self.setIconSize(QSize(30, 30))
+        self.setIcon(_cached_icon(MDI6.export, (0, 255, 0)))
+        self.setIconSize(_ICON_SIZE)
 
         self.clicked.connect(self._export_data)
 
@@ -127,9 +166,12 @@ class ExportButton(QPushButton):
         @ensure_main_thread  # type: ignore
         def cb(future: Future[Iterable[tuple[Indices, np.ndarray]]]) -> None:
             view = View(self._mmc)
+            view.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+            view.destroyed.connect(lambda: self._view._views.remove(view))
 
             for idx, datum in future.result():
-                view.set_data(datum, initial_index=idx)
+                # The Viewfinder buffer is overwritten by the next frame - copy it
+                view.set_data(datum.copy(), initial_index=idx)
 
             view.show()
             view.raise_()
@@ -166,29 +208,27 @@ class Viewfinder(View):
         self._btns.insertWidget(2, ExportButton(mmcore=self._mmc, viewfinder=self))
 
         # Create initial buffer
-        self.ts_array = None
-        self.ts_shape = (0, 0)
-        self.bytes_per_pixel = 0
+        self.buffer: np.ndarray | None = None
+        # Buffers are kept per (shape, dtype), so that switching back and forth
+        # between camera configurations does not reallocate them.
+        self._buffers: dict[tuple[tuple[int, ...], np.dtype], np.ndarray] = {}
 
     # # Begin TODO: Remove once https://github.com/pyapp-kit/ndv/issues/39 solved
 
-    def _update_datastore(self) -> Any:
-        if (
-            self.ts_array is None
-            or self.ts_shape[0] != self._mmc.getImageHeight()
-            or self.ts_shape[1] != self._mmc.getImageWidth()
-            or self.bytes_per_pixel != self._mmc.getBytesPerPixel()
-        ):
-            self.ts_shape = (self._mmc.getImageHeight(), self._mmc.getImageWidth())
-            self.bytes_per_pixel = self._mmc.getBytesPerPixel()
-            self.ts_array = ts.open(
-                {"driver": "zarr", "kvstore": {"driver": "memory"}},
-                create=True,
-                shape=self.ts_shape,
-                dtype=_data_type(self._mmc),
-            ).result()
-            super().set_data(self.ts_array)
-        return self.ts_array
+    def _update_datastore(self, data: np.ndarray) -> np.ndarray:
+        # Keyed on the frame itself rather than on the core's image geometry,
+        # which would cost three calls into MMCore on every frame.
+        key = (data.shape, data.dtype)
+        if (buffer := self._buffers.pop(key, None)) is None:
+            # A plain ndarray - a zarr memory store would cost an extra copy
+            # (and codec pass) on every write.
+            buffer = np.empty(data.shape, dtype=data.dtype)
+            if len(self._buffers) >= MAX_BUFFERS:
+                # Evict the least recently used buffer
+                del self._buffers[next(iter(self._buffers))]
+        # (Re)inserted last, keeping the dict ordered by recency
+        self._buffers[key] = buffer
+        return buffer
 
     def set_data(
         self,
@@ -198,9 +238,16 @@ class Viewfinder(View):
     ) -> None:
         if initial_index is None:
             initial_index = {}
-        array = self._update_datastore()
-        array[:] = data
-        self.set_current_index(initial_index)
+        data = np.asarray(data)
+        buffer = self._update_datastore(data)
+        np.copyto(buffer, data)
+        if buffer is not self.buffer:
+            # New buffer - set_data also displays initial_index
+            self.buffer = buffer
+            super().set_data(self.buffer, initial_index=initial_index)
+        else:
+            # Same buffer, new pixels - only the displayed slice needs a refresh
+            self.set_current_index(initial_index)
 
     # # End TODO: Remove once https://github.com/pyapp-kit/ndv/issues/39 solved
 